@@ -6,22 +6,57 @@ import os
 import re
 import sys
 
-import pkg_resources  # part of setuptools
 from colorama import Fore
 
+if sys.version_info >= (3, 8):
+    from importlib.metadata import PackageNotFoundError, version
+else:
+    from pkg_resources import DistributionNotFound as PackageNotFoundError
+    from pkg_resources import get_distribution  # part of setuptools
+
+    def version(distribution_name):
+        return get_distribution(distribution_name).version
+
+
 # correct function style detection is obtained only if following regex are
 # tested in sequence.  styles are listed as follows:
 # 0) function keyword, open/closed parentheses, e.g.      function foo()
 # 1) function keyword, NO open/closed parentheses, e.g.   function foo
 # 2) NO function keyword, open/closed parentheses, e.g.   foo()
 FUNCTION_STYLE_REGEX = [
-    r"\bfunction\s+(\w*)\s*\(\s*\)\s*",
-    r"\bfunction\s+(\w*)\s*",
-    r"\b\s*(\w*)\s*\(\s*\)\s*",
+    re.compile(r"\bfunction\s+(\w*)\s*\(\s*\)\s*"),
+    re.compile(r"\bfunction\s+(\w*)\s*"),
+    re.compile(r"\b\s*(\w*)\s*\(\s*\)\s*"),
 ]
 
 FUNCTION_STYLE_REPLACEMENT = [r"function \g<1>() ", r"function \g<1> ", r"\g<1>() "]
 
+# patterns used on every line by get_test_record() and beautify_string(), compiled
+# once here instead of going through the re module cache on each call
+SINGLE_QUOTED_REGEX = re.compile(r"\'.*?\'")
+DOUBLE_QUOTED_REGEX = re.compile(r'".*?"')
+BACKTICK_QUOTED_REGEX = re.compile(r"`.*?`")
+ESCAPED_BACKTICK_QUOTED_REGEX = re.compile(r"\\`.*?\'")
+ESCAPED_CHAR_REGEX = re.compile(r"\\.")
+COMMENT_REGEX = re.compile(r"(\A|\s)(#.*)")
+CASE_TERMINATOR_REGEX = re.compile(r"(\S);;")
+LINE_CONTINUATION_REGEX = re.compile(r"\\$")
+MULTILINE_STRING_END_REGEX = re.compile(r'^[^"]*"')
+MULTILINE_STRING_START_REGEX = re.compile(r'"[^"]*?\\$')
+HERE_DOC_DELIMITER_REGEX = re.compile(r'.*<<-?\s*[\'|"]?([_|\w]+)[\'|"]?.*')
+QUOTE_START_REGEX = re.compile(r'(\A|\s)(\'|")')
+LAST_QUOTE_REGEX = re.compile(r'.*([\'"]).*')
+FORMATTER_ON_REGEX = re.compile(r"#\s*@formatter:on")
+FORMATTER_OFF_REGEX = re.compile(r"#\s*@formatter:off")
+INDENT_KEYWORD_REGEX = re.compile(r"(\s|\A|;)(case|then|do)(;|\Z|\s)")
+OPEN_BRACKET_REGEX = re.compile(r"(\{|\(|\[)")
+OUTDENT_KEYWORD_REGEX = re.compile(r"(\s|\A|;)(esac|fi|done|elif)(;|\)|\||\Z|\s)")
+CLOSE_BRACKET_REGEX = re.compile(r"(\}|\)|\])")
+ESAC_REGEX = re.compile(r"\besac\b")
+CASE_REGEX = re.compile(r"\bcase\b")
+CASE_CHOICE_REGEX = re.compile(r"\A[^(]*\)")
+ELSE_REGEX = re.compile(r"^(else|elif\s.*?;\s+?then)")
+
 
 def main():
     """Call the main function."""
@@ -56,7 +91,7 @@ class Beautify:
         index = 0
         # IMPORTANT: apply regex sequentially and stop on the first match:
         for regex in FUNCTION_STYLE_REGEX:
-            if re.search(regex, test_record):
+            if regex.search(test_record):
                 return index
             index += 1
         return None
@@ -72,7 +107,7 @@ class Beautify:
             return stripped_record
         regex = FUNCTION_STYLE_REGEX[func_decl_style]
         replacement = FUNCTION_STYLE_REPLACEMENT[self.apply_function_style]
-        changed_record = re.sub(regex, replacement, stripped_record)
+        changed_record = regex.sub(replacement, stripped_record)
         return changed_record.strip()
 
     def get_test_record(self, source_line):
@@ -84,17 +119,17 @@ class Beautify:
         test_record = test_record.replace('\\"', "")
 
         # collapse multiple quotes between ' ... '
-        test_record = re.sub(r"\'.*?\'", "", test_record)
+        test_record = SINGLE_QUOTED_REGEX.sub("", test_record)
         # collapse multiple quotes between " ... "
-        test_record = re.sub(r'".*?"', "", test_record)
+        test_record = DOUBLE_QUOTED_REGEX.sub("", test_record)
         # collapse multiple quotes between ` ... `
-        test_record = re.sub(r"`.*?`", "", test_record)
+        test_record = BACKTICK_QUOTED_REGEX.sub("", test_record)
         # collapse multiple quotes between \` ... ' (weird case)
-        test_record = re.sub(r"\\`.*?\'", "", test_record)
+        test_record = ESCAPED_BACKTICK_QUOTED_REGEX.sub("", test_record)
         # strip out any escaped single characters
-        test_record = re.sub(r"\\.", "", test_record)
+        test_record = ESCAPED_CHAR_REGEX.sub("", test_record)
         # remove '#' comments
-        test_record = re.sub(r"(\A|\s)(#.*)", "", test_record, 1)
+        test_record = COMMENT_REGEX.sub("", test_record, 1)
         return test_record
 
     def beautify_string(self, data, path=""):
@@ -114,7 +149,8 @@ class Beautify:
         output = []
         line = 1
         formatter = True
-        for record in re.split("\n", data):
+        indent = self.tab_str * self.tab_size
+        for record in data.split("\n"):
             record = record.rstrip()
             stripped_record = record.strip()
 
@@ -125,13 +161,13 @@ class Beautify:
 
             # ensure space before ;; terminators in case statements
             if case_level:
-                stripped_record = re.sub(r"(\S);;", r"\1 ;;", stripped_record)
+                stripped_record = CASE_TERMINATOR_REGEX.sub(r"\1 ;;", stripped_record)
 
             test_record = self.get_test_record(stripped_record)
 
             # detect whether this line ends with line continuation character:
             prev_line_had_continue = continue_line
-            continue_line = True if (re.search(r"\\$", stripped_record) is not None) else False
+            continue_line = LINE_CONTINUATION_REGEX.search(stripped_record) is not None
             inside_multiline_quoted_string = (
                 prev_line_had_continue and continue_line and started_multiline_quoted_string
             )
@@ -139,7 +175,7 @@ class Beautify:
             if not continue_line and prev_line_had_continue and started_multiline_quoted_string:
                 # remove contents of strings initiated on previous lines and
                 # that are ending on this line:
-                [test_record, num_subs] = re.subn(r'^[^"]*"', "", test_record)
+                [test_record, num_subs] = MULTILINE_STRING_END_REGEX.subn("", test_record)
                 ended_multiline_quoted_string = True if num_subs > 0 else False
             else:
                 ended_multiline_quoted_string = False
@@ -151,7 +187,7 @@ class Beautify:
             ):  # pass on with no changes
                 output.append(record)
                 # now test for here-doc termination string
-                if re.search(here_string, test_record) and not re.search(r"<<", test_record):
+                if re.search(here_string, test_record) and "<<" not in test_record:
                     in_here_doc = False
             else:  # not in here doc or inside multiline-quoted
 
@@ -165,16 +201,16 @@ class Beautify:
                         # remove contents of strings initiated on current line
                         # but that continue on next line (in particular we need
                         # to ignore brackets they may contain!)
-                        [test_record, num_subs] = re.subn(r'"[^"]*?\\$', "", test_record)
+                        [test_record, num_subs] = MULTILINE_STRING_START_REGEX.subn(
+                            "", test_record
+                        )
                         started_multiline_quoted_string = True if num_subs > 0 else False
                 else:
                     # this line is not STARTING a multiline-quoted string
                     started_multiline_quoted_string = False
 
-                if (re.search(r"<<-?", test_record)) and not (re.search(r".*<<<", test_record)):
-                    here_string = re.sub(
-                        r'.*<<-?\s*[\'|"]?([_|\w]+)[\'|"]?.*', r"\1", stripped_record, 1
-                    )
+                if "<<" in test_record and "<<<" not in test_record:
+                    here_string = HERE_DOC_DELIMITER_REGEX.sub(r"\1", stripped_record, 1)
                     in_here_doc = len(here_string) > 0
 
                 if in_ext_quote:
@@ -183,20 +219,20 @@ class Beautify:
                         test_record = re.sub(r".*%s(.*)" % ext_quote_string, r"\1", test_record, 1)
                         in_ext_quote = False
                 else:  # not in ext quote
-                    if re.search(r'(\A|\s)(\'|")', test_record):
+                    if QUOTE_START_REGEX.search(test_record):
                         # apply only after this line has been processed
                         defer_ext_quote = True
-                        ext_quote_string = re.sub(r'.*([\'"]).*', r"\1", test_record, 1)
+                        ext_quote_string = LAST_QUOTE_REGEX.sub(r"\1", test_record, 1)
                         # provide line before quote
                         test_record = re.sub(r"(.*)%s.*" % ext_quote_string, r"\1", test_record, 1)
                 if in_ext_quote or not formatter:
                     # pass on unchanged
                     output.append(record)
-                    if re.search(r"#\s*@formatter:on", stripped_record):
+                    if FORMATTER_ON_REGEX.search(stripped_record):
                         formatter = True
                         continue
                 else:  # not in ext quote
-                    if re.search(r"#\s*@formatter:off", stripped_record):
+                    if FORMATTER_OFF_REGEX.search(stripped_record):
                         formatter = False
                         output.append(record)
                         continue
@@ -205,16 +241,11 @@ class Beautify:
                     if open_brackets:
                         output.append(record)
                     else:
-                        inc = len(re.findall(r"(\s|\A|;)(case|then|do)(;|\Z|\s)", test_record))
-                        inc += len(re.findall(r"(\{|\(|\[)", test_record))
-                        outc = len(
-                            re.findall(
-                                r"(\s|\A|;)(esac|fi|done|elif)(;|\)|\||\Z|\s)",
-                                test_record,
-                            )
-                        )
-                        outc += len(re.findall(r"(\}|\)|\])", test_record))
-                        if re.search(r"\besac\b", test_record):
+                        inc = len(INDENT_KEYWORD_REGEX.findall(test_record))
+                        inc += len(OPEN_BRACKET_REGEX.findall(test_record))
+                        outc = len(OUTDENT_KEYWORD_REGEX.findall(test_record))
+                        outc += len(CLOSE_BRACKET_REGEX.findall(test_record))
+                        if ESAC_REGEX.search(test_record):
                             if case_level == 0:
                                 sys.stderr.write(
                                     'File %s: error: "esac" before "case" in '
@@ -225,13 +256,13 @@ class Beautify:
                                 case_level -= 1
 
                         # special handling for bad syntax within case ... esac
-                        if re.search(r"\bcase\b", test_record):
+                        if CASE_REGEX.search(test_record):
                             inc += 1
                             case_level += 1
 
                         choice_case = 0
                         if case_level:
-                            if re.search(r"\A[^(]*\)", test_record):
+                            if CASE_CHOICE_REGEX.search(test_record):
                                 inc += 1
                                 choice_case = -1
 
@@ -243,9 +274,7 @@ class Beautify:
                             )
 
                         # an ad-hoc solution for the "else" or "elif ... then" keywords
-                        else_case = (0, -1)[
-                            re.search(r"^(else|elif\s.*?;\s+?then)", test_record) is not None
-                        ]
+                        else_case = (0, -1)[ELSE_REGEX.search(test_record) is not None]
 
                         net = inc - outc
                         tab += min(net, 0)
@@ -260,15 +289,15 @@ class Beautify:
                         ):
                             extab += 1
                         extab = max(0, extab)
-                        output.append((self.tab_str * self.tab_size * extab) + stripped_record)
+                        output.append((indent * extab) + stripped_record)
                         tab += max(net, 0)
                 if defer_ext_quote:
                     in_ext_quote = True
                     defer_ext_quote = False
 
                 # count open brackets for line continuation
-                open_brackets += len(re.findall(r"\[", test_record))
-                open_brackets -= len(re.findall(r"\]", test_record))
+                open_brackets += test_record.count("[")
+                open_brackets -= test_record.count("]")
             line += 1
         error = tab != 0
         if error:
@@ -348,15 +377,16 @@ class Beautify:
 
     def get_version(self):
         try:
-            return pkg_resources.require("beautysh")[0].version
-        except pkg_resources.DistributionNotFound:
+            return version("beautysh")
+        except PackageNotFoundError:
             return "Not Available"
 
     def main(self):
         """Main beautifying function."""
         error = False
+        beautysh_version = self.get_version()
         parser = argparse.ArgumentParser(
-            description="A Bash beautifier for the masses, version {}".format(self.get_version()),
+            description="A Bash beautifier for the masses, version {}".format(beautysh_version),
             add_help=False,
         )
         parser.add_argument(
@@ -408,7 +438,7 @@ class Beautify:
             self.print_help(parser)
             exit()
         if args.version:
-            sys.stdout.write("%s\n" % self.get_version())
+            sys.stdout.write("%s\n" % beautysh_version)
             exit()
         if type(args.indent_size) is list:
             args.indent_size = args.indent_size[0]
@@ -1,57 +1,67 @@
+import difflib
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple
-from unittest import TestCase
+from typing import Optional, Tuple
+
+import pytest
 
 from beautysh import Beautify
 
+# leading whitespace is made visible in mismatch messages as '.' (space) and 'T' (tab)
+WHITESPACE_HIGHLIGHT_TABLE = str.maketrans({" ": ".", "\t": "T"})
+
+
+@lru_cache(maxsize=None)
+def read_file(file: Path) -> str:
+    """Read file into string, once per test session."""
+    return file.read_bytes().decode("utf-8")
+
+
+def beautify_ok(raw: str, apply_function_style: Optional[int] = None) -> str:
+    """Beautify string and assert that indents and outdents balanced out."""
+    formatter = Beautify()
+    formatter.apply_function_style = apply_function_style
+    result, error = formatter.beautify_string(raw)
+    assert not error, "Indent/outdent mismatch"
+    return result
+
+
+def highlight_string(string: str) -> str:
+    indent = len(string) - len(string.lstrip(" \t"))
+    return string[:indent].translate(WHITESPACE_HIGHLIGHT_TABLE) + string[indent:]
+
+
+def assert_equal_multiline_strings(actual: str, expected: str):
+    if actual == expected:
+        return
+
+    actual_lines = actual.split("\n")
+    expected_lines = expected.split("\n")
+    if len(actual_lines) != len(expected_lines):
+        delta = difflib.unified_diff(
+            expected_lines, actual_lines, "expected", "actual", lineterm=""
+        )
+        pytest.fail("Mismatched line counts:\n" + "\n".join(delta))
+
+    line_pairs = enumerate(zip(expected_lines, actual_lines))
+    idx = next(
+        idx for idx, (expected_line, actual_line) in line_pairs if expected_line != actual_line
+    )
+    pytest.fail(
+        ("Mismatch on line {}:\n" "Expected: {}\n" "Got: {}\n").format(
+            idx + 1,
+            highlight_string(expected_lines[idx]),
+            highlight_string(actual_lines[idx]),
+        )
+    )
+
+
+def generate_test_tuple(fixture_dir: Path, test_name: str) -> Tuple[str, str]:
+    raw = fixture_dir / "{}_raw.sh".format(test_name)
+    formatted = fixture_dir / "{}_formatted.sh".format(test_name)
+    return read_file(raw), read_file(formatted)
+
 
-class BeautyshTest(TestCase):
-    def __init__(self, method_name: str, fixture_dir: Path):
-        TestCase.__init__(self, method_name)
-        self.fixture_dir = fixture_dir
-
-    def read_file(self, file: Path) -> str:
-        """Read file into string."""
-        with open(file) as f:
-            return f.read()
-
-    def highlight_string(self, string: str) -> str:
-        if len(string) == 0:
-            return string
-
-        output = ""
-        idx = 0
-        while string[idx] == " " or string[idx] == "\t":
-            if string[idx] == " ":
-                output += "."
-            elif string[idx] == "\t":
-                output += "T"
-            idx += 1
-        output += string[idx:]
-        return output
-
-    def assert_equal_multiline_strings(self, actual: str, expected: str):
-        actual_lines = actual.split("\n")
-        expected_lines = expected.split("\n")
-        self.assertEqual(len(actual_lines), len(expected_lines), "Mismatched line counts")
-        for idx in range(0, len(expected_lines)):
-            self.assertEqual(
-                expected_lines[idx],
-                actual_lines[idx],
-                ("Mismatch on line {}:\n" "Expected: {}\n" "Got: {}\n").format(
-                    idx + 1,
-                    self.highlight_string(expected_lines[idx]),
-                    self.highlight_string(actual_lines[idx]),
-                ),
-            )
-
-    def generate_test_tuple(self, test_name: str) -> Tuple[str, str]:
-        raw = self.fixture_dir / "{}_raw.sh".format(test_name)
-        formatted = self.fixture_dir / "{}_formatted.sh".format(test_name)
-        return self.read_file(raw), self.read_file(formatted)
-
-    def assert_formatting(self, test_name: str):
-        raw, formatted = self.generate_test_tuple(test_name)
-        test, error = Beautify().beautify_string(raw)
-        self.assertFalse(error)
-        self.assert_equal_multiline_strings(test, formatted)
+def assert_formatting(fixture_dir: Path, test_name: str):
+    raw, formatted = generate_test_tuple(fixture_dir, test_name)
+    assert_equal_multiline_strings(beautify_ok(raw), formatted)
@@ -0,0 +1,13 @@
+#!/usr/bin/env bash
+
+if true
+then
+        read -r first rest <<< "$line"
+  while read -r word
+      do
+ echo "$word"
+  done <<<"$rest"
+    cat <<-EOF
+	kept as is
+	EOF
+fi